@@ -1,5 +1,14 @@
 """color_picker package."""
 
 from .base import *
-from .tui import *
 from .cli import main
+
+# The TUI pulls in Textual (and NumPy via base_vec); only import it on first use
+_TUI_NAMES = ("ColorPickerApp", "ColorPreview", "ColorThemeItem")
+
+
+def __getattr__(name: str):
+    if name in _TUI_NAMES:
+        from . import tui
+        return getattr(tui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,12 +4,34 @@ Core color utilities and theme generation.
 No TUI dependencies - can be used by CLI or TUI.
 """
 
-import colorsys
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 
-# Cache for classifications data
-_classifications_cache: dict[str, dict] | None = None
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON when installed
+    orjson = None
+
+try:
+    from . import _data  # Baked into the wheel by scripts/bake_data.py
+except ImportError:
+    _data = None
+
+
+def _loads_json(data: bytes):
+    """Parse JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_json(obj) -> bytes:
+    """Serialize to 2-space indented JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
 
 
 def _srgb_to_linear(u: float) -> float:
@@ -17,12 +39,19 @@ def _srgb_to_linear(u: float) -> float:
     return u / 12.92 if u <= 0.03928 else ((u + 0.055) / 1.055) ** 2.4
 
 
+# _srgb_to_linear for every 8-bit channel value, pre-multiplied by each
+# channel's luminance weight
+_SRGB_LUT: list[float] = [_srgb_to_linear(i / 255) for i in range(256)]
+_R_LUM: list[float] = [0.2126 * v for v in _SRGB_LUT]
+_G_LUM: list[float] = [0.7152 * v for v in _SRGB_LUT]
+_B_LUM: list[float] = [0.0722 * v for v in _SRGB_LUT]
+
+
+@lru_cache(maxsize=1024)
 def relative_luminance(hex_color: str) -> float:
     """Calculate relative luminance per WCAG 2.1."""
-    hex_color = hex_color.lstrip('#')
-    r, g, b = (int(hex_color[i:i+2], 16) / 255 for i in (0, 2, 4))
-    r_lin, g_lin, b_lin = _srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)
-    return 0.2126 * r_lin + 0.7152 * g_lin + 0.0722 * b_lin
+    r, g, b = bytes.fromhex(hex_color.removeprefix('#')[:6])
+    return _R_LUM[r] + _G_LUM[g] + _B_LUM[b]
 
 
 def contrast_ratio(color1: str, color2: str) -> float:
@@ -33,20 +62,73 @@ def contrast_ratio(color1: str, color2: str) -> float:
     return (lighter + 0.05) / (darker + 0.05)
 
 
+@lru_cache(maxsize=1024)
 def hex_to_hsl(hex_color: str) -> tuple[float, float, float]:
     """Convert hex color to HSL (hue 0-360, sat 0-100, light 0-100)."""
-    hex_color = hex_color.lstrip('#')
-    r, g, b = tuple(int(hex_color[i:i+2], 16) / 255 for i in (0, 2, 4))
-    h, l, s = colorsys.rgb_to_hls(r, g, b)
-    return h * 360, s * 100, l * 100
-
-
+    # colorsys.rgb_to_hls, inlined
+    ri, gi, bi = bytes.fromhex(hex_color.removeprefix('#')[:6])
+    r, g, b = ri / 255, gi / 255, bi / 255
+    maxc = max(r, g, b)
+    minc = min(r, g, b)
+    sumc = maxc + minc
+    l = sumc / 2.0
+    if minc == maxc:
+        return 0.0, 0.0, l * 100
+    rangec = maxc - minc
+    s = rangec / sumc if l <= 0.5 else rangec / (2.0 - maxc - minc)
+    rc = (maxc - r) / rangec
+    gc = (maxc - g) / rangec
+    bc = (maxc - b) / rangec
+    if r == maxc:
+        h = bc - gc
+    elif g == maxc:
+        h = 2.0 + rc - bc
+    else:
+        h = 4.0 + gc - rc
+    return (h / 6.0) % 1.0 * 360, s * 100, l * 100
+
+
+ONE_THIRD = 1.0 / 3.0
+ONE_SIXTH = 1.0 / 6.0
+TWO_THIRD = 2.0 / 3.0
+
+
+# Two-digit hex for every 8-bit channel value
+_HEX_LUT: tuple[str, ...] = tuple(f"{i:02x}" for i in range(256))
+
+
+def _hue_channel(m1: float, m2: float, hue: float) -> float:
+    hue = hue % 1.0
+    if hue < ONE_SIXTH:
+        return m1 + (m2 - m1) * hue * 6.0
+    if hue < 0.5:
+        return m2
+    if hue < TWO_THIRD:
+        return m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0
+    return m1
+
+
+@lru_cache(maxsize=1024)
 def hsl_to_hex(h: float, s: float, l: float) -> str:
     """Convert HSL (hue 0-360, sat 0-100, light 0-100) to hex color."""
-    r, g, b = colorsys.hls_to_rgb(h / 360, l / 100, s / 100)
-    return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
-
-
+    # colorsys.hls_to_rgb, inlined
+    h, s, l = h / 360, s / 100, l / 100
+    if s == 0.0:
+        r = g = b = l
+    else:
+        m2 = l * (1.0 + s) if l <= 0.5 else l + s - (l * s)
+        m1 = 2.0 * l - m2
+        r = _hue_channel(m1, m2, h + ONE_THIRD)
+        g = _hue_channel(m1, m2, h)
+        b = _hue_channel(m1, m2, h - ONE_THIRD)
+    # Round to nearest (like the extension's Math.round); clamp float overshoot
+    ri = min(255, max(0, int(r * 255 + 0.5)))
+    gi = min(255, max(0, int(g * 255 + 0.5)))
+    bi = min(255, max(0, int(b * 255 + 0.5)))
+    return "#" + _HEX_LUT[ri] + _HEX_LUT[gi] + _HEX_LUT[bi]
+
+
+@lru_cache(maxsize=1024)
 def generate_bright_version(hex_color: str, lightness_boost: float | None = None) -> str:
     """Generate a brighter version of the given color.
 
@@ -65,16 +147,40 @@ def generate_bright_version(hex_color: str, lightness_boost: float | None = None
     return hsl_to_hex(h, s, new_l)
 
 
+@lru_cache(maxsize=1024)
 def choose_foreground(bg_hex: str) -> str:
     """Choose black or white foreground based on background luminance."""
-    lum = relative_luminance(bg_hex)
+    r, g, b = bytes.fromhex(bg_hex.removeprefix('#')[:6])
+    lum = _R_LUM[r] + _G_LUM[g] + _B_LUM[b]
     # WCAG recommends 4.5:1 for normal text; we use luminance threshold
     # Dark bg (lum < 0.4) -> white text, Light bg -> black text
     return "#ffffff" if lum < 0.4 else "#000000"
 
 
-def generate_color_customizations(base_color: str, bright_color: str) -> dict:
-    """Generate VS Code settings dict with proper foreground colors."""
+# workbench.colorCustomizations keys, in the order _color_customizations fills them
+_CUSTOMIZATION_KEYS: tuple[str, ...] = (
+    # Title bar
+    "titleBar.activeBackground",
+    "titleBar.activeForeground",
+    "titleBar.inactiveBackground",
+    "titleBar.inactiveForeground",
+    "titleBar.border",
+    # Status bar
+    "statusBar.background",
+    "statusBar.foreground",
+    "statusBar.debuggingBackground",
+    "statusBar.debuggingForeground",
+    # Activity bar
+    "activityBar.background",
+    "activityBar.foreground",
+    # Tabs
+    "tab.activeBorder",
+)
+
+
+@lru_cache(maxsize=1024)
+def _color_customizations(base_color: str, bright_color: str) -> dict[str, str]:
+    """Build the workbench.colorCustomizations entries (cached; don't mutate)."""
     # Choose foreground colors based on background luminance
     base_fg = choose_foreground(base_color)
     bright_fg = choose_foreground(bright_color)
@@ -84,26 +190,18 @@ def generate_color_customizations(base_color: str, bright_color: str) -> dict:
     activity_bar_bg = hsl_to_hex(h, s, max(10, l - 10))
     activity_bar_fg = choose_foreground(activity_bar_bg)
 
-    return {
-        "workbench.colorCustomizations": {
-            # Title bar
-            "titleBar.activeBackground": base_color,
-            "titleBar.activeForeground": base_fg,
-            "titleBar.inactiveBackground": bright_color,
-            "titleBar.inactiveForeground": bright_fg,
-            "titleBar.border": bright_color,
-            # Status bar
-            "statusBar.background": bright_color,
-            "statusBar.foreground": bright_fg,
-            "statusBar.debuggingBackground": bright_color,
-            "statusBar.debuggingForeground": bright_fg,
-            # Activity bar
-            "activityBar.background": activity_bar_bg,
-            "activityBar.foreground": activity_bar_fg,
-            # Tabs
-            "tab.activeBorder": bright_color,
-        }
-    }
+    return dict(zip(_CUSTOMIZATION_KEYS, (
+        base_color, base_fg, bright_color, bright_fg, bright_color,
+        bright_color, bright_fg, bright_color, bright_fg,
+        activity_bar_bg, activity_bar_fg,
+        bright_color,
+    )))
+
+
+def generate_color_customizations(base_color: str, bright_color: str) -> dict:
+    """Generate VS Code settings dict with proper foreground colors."""
+    # Fresh inner dict so callers can't mutate the cached one
+    return {"workbench.colorCustomizations": dict(_color_customizations(base_color, bright_color))}
 
 
 def get_colors_json_path(base_path: Path | None = None) -> Path:
@@ -132,22 +230,27 @@ def get_classifications_path(base_path: Path | None = None) -> Path:
     return Path(__file__).parent.parent / "data" / "classifications.json"
 
 
+@lru_cache(maxsize=32)
+def _load_classifications_cached(path: Path, mtime_ns: int) -> dict[str, dict]:
+    data = _loads_json(path.read_bytes())
+    # Index by name for fast lookup
+    return {entry["name"]: entry for entry in data}
+
+
 def load_classifications(base_path: Path | None = None) -> dict[str, dict]:
-    """Load classifications.json and return dict keyed by color name."""
-    global _classifications_cache
-    if _classifications_cache is not None:
-        return _classifications_cache
+    """Load classifications.json and return dict keyed by color name.
 
+    Cached per resolved path and re-read when the file changes (mtime).
+    The returned dict is shared - don't mutate it.
+    """
+    if base_path is None and _data is not None:
+        return _data.CLASSIFICATIONS
     path = get_classifications_path(base_path)
-    if not path.exists():
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
-
-    with open(path) as f:
-        data = json.load(f)
-
-    # Index by name for fast lookup
-    _classifications_cache = {entry["name"]: entry for entry in data}
-    return _classifications_cache
+    return _load_classifications_cached(path.resolve(), mtime_ns)
 
 
 def get_color_status(name: str, base_path: Path | None = None) -> str:
@@ -159,13 +262,77 @@ def get_color_status(name: str, base_path: Path | None = None) -> str:
     return "UNKNOWN"
 
 
-def load_themes(base_path: Path | None = None) -> dict[str, dict[str, str]]:
-    """Load all color themes from colors.json."""
+def _themes_source(base_path: Path | None) -> tuple[Path, int] | None:
+    """Cache key for colors.json: (resolved path, mtime), or None for baked data."""
+    if base_path is None and _data is not None:
+        return None
     colors_path = get_colors_json_path(base_path)
-    if not colors_path.exists():
-        raise FileNotFoundError(f"colors.json not found at {colors_path}")
-    with open(colors_path) as f:
-        return json.load(f)
+    try:
+        mtime_ns = colors_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"colors.json not found at {colors_path}") from None
+    return colors_path.resolve(), mtime_ns
+
+
+@lru_cache(maxsize=32)
+def _load_themes_cached(source: tuple[Path, int] | None) -> dict[str, dict[str, str]]:
+    if source is None:
+        return _data.COLORS
+    return _loads_json(source[0].read_bytes())
+
+
+@lru_cache(maxsize=32)
+def _load_theme_index_cached(source: tuple[Path, int] | None) -> dict[str, tuple[str, str]]:
+    index: dict[str, tuple[str, str]] = {}
+    for category, colors in _load_themes_cached(source).items():
+        for name, hex_color in colors.items():
+            # First category wins, like a scan in file order
+            index.setdefault(name, (category, hex_color))
+    return index
+
+
+def load_themes(base_path: Path | None = None) -> dict[str, dict[str, str]]:
+    """Load all color themes from colors.json.
+
+    Cached per resolved path and re-read when the file changes (mtime).
+    The returned dict is shared - don't mutate it.
+    """
+    return _load_themes_cached(_themes_source(base_path))
+
+
+def load_theme_index(base_path: Path | None = None) -> dict[str, tuple[str, str]]:
+    """Map each theme name to its (category, hex color).
+
+    Cached alongside load_themes; the returned dict is shared - don't mutate it.
+    """
+    return _load_theme_index_cached(_themes_source(base_path))
+
+
+def get_expanded_colors_path() -> Path:
+    """Get path to colors_expanded.json (precomputed bright variants)."""
+    return Path(__file__).parent / "colors_expanded.json"
+
+
+@lru_cache(maxsize=1)
+def load_bright_colors() -> dict[str, str]:
+    """Load precomputed bright variants as {base_hex: bright_hex}.
+
+    Generated by scripts/precompute_palette.py; returns {} if missing.
+    """
+    try:
+        data = _loads_json(get_expanded_colors_path().read_bytes())
+    except FileNotFoundError:
+        return {}
+
+    return {entry["base"]: entry["bright"] for entry in data.values()}
+
+
+def lookup_bright_version(base_color: str) -> str:
+    """Bright version of a color, precomputed when it's a bundled theme."""
+    bright_color = load_bright_colors().get(base_color)
+    if bright_color is None:
+        bright_color = generate_bright_version(base_color)
+    return bright_color
 
 
 def load_themes_with_status(base_path: Path | None = None) -> dict[str, dict[str, dict]]:
@@ -189,11 +356,47 @@ def load_themes_with_status(base_path: Path | None = None) -> dict[str, dict[str
     return result
 
 
-def write_theme(base_color: str, workspace_path: Path) -> None:
-    """Write theme to workspace's .vscode/settings.json."""
-    bright_color = generate_bright_version(base_color)
+@lru_cache(maxsize=1024)
+def _settings_json(base_color: str) -> bytes:
+    """Serialized settings.json content for a theme (cached per color)."""
+    bright_color = lookup_bright_version(base_color)
     colors = generate_color_customizations(base_color, bright_color)
+    return _dumps_json(colors)
+
+
+# .vscode dirs already created this process; skips a mkdir per write
+_ENSURED_DIRS: set[Path] = set()
+# settings.json path -> (content we last wrote, its mtime right after)
+_LAST_WRITE: dict[Path, tuple[bytes, int]] = {}
+
+
+def write_theme(base_color: str, workspace_path: Path) -> None:
+    """Write theme to workspace's .vscode/settings.json.
+
+    Written to a temp file and swapped in with os.replace, so VS Code never
+    reads a half-written settings.json. Skipped when the file still holds
+    exactly what we last wrote there (same content, untouched mtime).
+    """
     settings_path = workspace_path / ".vscode" / "settings.json"
-    settings_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(settings_path, "w") as f:
-        json.dump(colors, f, indent=4)
+    content = _settings_json(base_color)
+    last = _LAST_WRITE.get(settings_path)
+    if last is not None and last[0] == content:
+        try:
+            if settings_path.stat().st_mtime_ns == last[1]:
+                return
+        except FileNotFoundError:
+            pass
+
+    parent = settings_path.parent
+    if parent not in _ENSURED_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(parent)
+    tmp_path = settings_path.with_name(settings_path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(content)
+    except FileNotFoundError:
+        # Dir was removed since we created it; recreate and retry once
+        parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(content)
+    os.replace(tmp_path, settings_path)
+    _LAST_WRITE[settings_path] = (content, settings_path.stat().st_mtime_ns)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Vectorized (NumPy) color math for whole palettes.
+Mirrors the scalar functions in base.py result-for-result.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .base import ONE_SIXTH, ONE_THIRD, TWO_THIRD
+
+
+def hex_to_rgb_array(hex_colors: list[str]) -> np.ndarray:
+    """Parse hex colors into an (N,3) float array of RGB in [0,1]."""
+    raw = bytes.fromhex("".join(h.removeprefix('#')[:6] for h in hex_colors))
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3) / 255
+
+
+def rgb_array_to_hex(rgb: np.ndarray) -> list[str]:
+    """Format an (N,3) float array of RGB in [0,1] as hex colors."""
+    channels = np.clip(rgb * 255 + 0.5, 0, 255).astype(np.int64)
+    return [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in channels.tolist()]
+
+
+def rgb_to_hls(rgb: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """colorsys.rgb_to_hls over an (N,3) array; returns (h, l, s) arrays in [0,1]."""
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    gray = minc == maxc
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(l <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc))
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = (h / 6.0) % 1.0
+
+    return np.where(gray, 0.0, h), l, np.where(gray, 0.0, s)
+
+
+def hex_to_hsl_array(hex_colors: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """hex_to_hsl over a palette: (hue 0-360, sat 0-100, light 0-100) arrays."""
+    h, l, s = rgb_to_hls(hex_to_rgb_array(hex_colors))
+    return h * 360, s * 100, l * 100
+
+
+def _v(m1: np.ndarray, m2: np.ndarray, hue: np.ndarray) -> np.ndarray:
+    hue = hue % 1.0
+    return np.select(
+        [hue < ONE_SIXTH, hue < 0.5, hue < TWO_THIRD],
+        [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0],
+        m1,
+    )
+
+
+def hls_to_rgb(h: np.ndarray, l: np.ndarray, s: np.ndarray) -> np.ndarray:
+    """colorsys.hls_to_rgb over arrays; returns an (N,3) RGB array in [0,1]."""
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+    rgb = np.stack([_v(m1, m2, h + ONE_THIRD), _v(m1, m2, h), _v(m1, m2, h - ONE_THIRD)], axis=1)
+    return np.where((s == 0.0)[:, None], l[:, None], rgb)
+
+
+@lru_cache(maxsize=8)
+def _bright_palette(hex_colors: tuple[str, ...]) -> tuple[str, ...]:
+    # Same steps as generate_bright_version, in its 0-360 / 0-100 units
+    h, s, l = hex_to_hsl_array(list(hex_colors))
+    lightness_boost = np.maximum(15, 35 - l * 0.33)
+    new_l = np.minimum(75, l + lightness_boost)
+    return tuple(rgb_array_to_hex(hls_to_rgb(h / 360, new_l / 100, s / 100)))
+
+
+def bright_palette(hex_colors: list[str]) -> list[str]:
+    """generate_bright_version for a whole palette in one vectorized pass."""
+    if not hex_colors:
+        return []
+    return list(_bright_palette(tuple(hex_colors)))
@@ -2,10 +2,9 @@
 """CLI for color picker."""
 
 import argparse
-import sys
 from pathlib import Path
 
-from .base import load_themes, write_theme
+from .base import load_theme_index, load_themes, write_theme
 
 
 def cmd_list(args: argparse.Namespace) -> None:
@@ -31,12 +30,12 @@ def cmd_apply(args: argparse.Namespace) -> None:
         raise ValueError("Must specify --theme or --color")
 
     # Find theme by name
-    themes = load_themes()
-    for category, colors in themes.items():
-        if args.theme in colors:
-            write_theme(colors[args.theme], workspace)
-            print(f"Applied {args.theme} ({colors[args.theme]}) to {workspace}")
-            return
+    entry = load_theme_index().get(args.theme)
+    if entry is not None:
+        _, hex_color = entry
+        write_theme(hex_color, workspace)
+        print(f"Applied {args.theme} ({hex_color}) to {workspace}")
+        return
 
     raise ValueError(f"Theme '{args.theme}' not found. Use 'list' to see available themes.")
 
@@ -3,59 +3,65 @@
 from pathlib import Path
 
 from textual.app import App, ComposeResult
-from textual.widgets import Header, Footer, ListView, ListItem, Static, Label
+from textual.timer import Timer
+from textual.widgets import Header, Footer, ListView, ListItem, Static
 from textual.containers import Horizontal, Vertical
 
 from .base import (
-    generate_bright_version,
     generate_color_customizations,
+    load_bright_colors,
     load_themes,
+    lookup_bright_version,
     write_theme,
 )
+from .base_vec import bright_palette
+
+# Seconds of idle navigation before the highlighted theme is written
+WRITE_DEBOUNCE = 0.1
+
 
 class ColorThemeItem(ListItem):
     """A list item representing a color theme."""
 
-    def __init__(self, theme_name: str, base_color: str) -> None:
+    def __init__(self, theme_name: str, base_color: str, bright_color: str | None = None) -> None:
         super().__init__()
         self.theme_name = theme_name
         self.base_color = base_color
-        self.bright_color = generate_bright_version(base_color)
+        self.bright_color = bright_color or lookup_bright_version(base_color)
         self.active_bg = base_color
         self.inactive_bg = self.bright_color
 
     def compose(self) -> ComposeResult:
-        with Horizontal(classes="theme-row"):
-            # Color preview boxes
-            yield Static(" ", classes="color-box", id=f"box1-{self.theme_name}")
-            yield Static(" ", classes="color-box", id=f"box2-{self.theme_name}")
-            # Theme name
-            yield Label(f"  {self.theme_name.upper()}", classes="theme-label")
-
-    def on_mount(self) -> None:
-        """Apply colors after mounting."""
-        box1 = self.query_one(f"#box1-{self.theme_name}")
-        box2 = self.query_one(f"#box2-{self.theme_name}")
-        box1.styles.background = self.active_bg
-        box2.styles.background = self.inactive_bg
+        # Color preview boxes and theme name, pre-rendered as one markup line
+        # rather than a row of child widgets styled one by one
+        yield Static(
+            f"[on {self.active_bg}]    [/] [on {self.inactive_bg}]    [/]   {self.theme_name.upper()}",
+            classes="theme-row",
+        )
 
 
 class ColorPreview(Static):
     """Shows a preview of the currently selected/hovered theme."""
 
+    # (setting key, short label) for each customization, in display order
+    PREVIEW_KEYS = tuple(
+        (key, key.split(".")[-1])
+        for key in generate_color_customizations("#000000", "#000000")["workbench.colorCustomizations"]
+    )
+
     def __init__(self) -> None:
         super().__init__()
         self.current_base_color: str = ""
 
-    def update_preview(self, theme_name: str, base_color: str) -> None:
+    def update_preview(self, theme_name: str, base_color: str, bright_color: str | None = None) -> None:
         self.current_base_color = base_color
-        bright_color = generate_bright_version(base_color)
-        colors = generate_color_customizations(base_color, bright_color)
-        customizations = colors.get("workbench.colorCustomizations", {})
+        if bright_color is None:
+            bright_color = lookup_bright_version(base_color)
+        customizations = generate_color_customizations(base_color, bright_color)["workbench.colorCustomizations"]
 
         lines = [f"[bold]{theme_name.upper()}[/bold]\n"]
-        for key, value in customizations.items():
-            short_key = key.split(".")[-1]
+        for key, short_key in self.PREVIEW_KEYS:
+            value = customizations[key]
             lines.append(f"  [{value}]██[/] {short_key}: {value}")
 
         self.update("\n".join(lines))
@@ -86,16 +92,6 @@ class ColorPickerApp(App):
         padding: 0 1;
     }
 
-    .color-box {
-        width: 4;
-        height: 1;
-        margin: 0 1 0 0;
-    }
-
-    .theme-label {
-        width: 1fr;
-    }
-
     #status {
         dock: bottom;
         height: 3;
@@ -124,14 +120,26 @@ class ColorPickerApp(App):
         # Default to package parent dir (the repo root)
         self.workspace_path = workspace_path or Path(__file__).parent.parent
         self.colors_by_category = load_themes(self.workspace_path)
+        # Debounced live-apply state
+        self._pending_color: str | None = None
+        self._write_timer: Timer | None = None
+        self._last_written: str | None = None
 
     def compose(self) -> ComposeResult:
         yield Header()
         with Horizontal():
             with ListView(id="theme-list"):
-                for category, colors in self.colors_by_category.items():
-                    for theme_name, base_color in colors.items():
-                        yield ColorThemeItem(theme_name, base_color)
+                themes = [
+                    (theme_name, base_color)
+                    for colors in self.colors_by_category.values()
+                    for theme_name, base_color in colors.items()
+                ]
+                # Precomputed bright variants, plus one vectorized pass for any others
+                bright_by_base = dict(load_bright_colors())
+                missing = list({base_color for _, base_color in themes if base_color not in bright_by_base})
+                bright_by_base.update(zip(missing, bright_palette(missing)))
+                for theme_name, base_color in themes:
+                    yield ColorThemeItem(theme_name, base_color, bright_by_base[base_color])
             with Vertical(id="preview-panel"):
                 yield ColorPreview()
                 yield Static("", id="status")
@@ -153,9 +161,9 @@ class ColorPickerApp(App):
             return
         if isinstance(event.item, ColorThemeItem):
             item = event.item
-            self.query_one(ColorPreview).update_preview(item.theme_name, item.base_color)
-            # Apply immediately as user navigates
-            self._write_theme(item.base_color)
+            self.query_one(ColorPreview).update_preview(item.theme_name, item.base_color, item.bright_color)
+            # Apply live as user navigates, once navigation pauses
+            self._schedule_write(item.base_color)
 
     def action_apply_theme(self) -> None:
         """Apply the currently selected theme to .vscode/settings.json."""
@@ -168,12 +176,39 @@ class ColorPickerApp(App):
         if not isinstance(item, ColorThemeItem):
             raise TypeError(f"Expected ColorThemeItem, got {type(item)}")
 
+        self._cancel_pending_write()
         self._write_theme(item.base_color)
         self._update_status(f"[green]Applied {item.theme_name.upper()} theme![/green]")
 
+    async def action_quit(self) -> None:
+        """Write any pending live-applied theme before quitting."""
+        self._flush_theme()
+        await super().action_quit()
+
+    def _schedule_write(self, base_color: str) -> None:
+        """Write `base_color` after WRITE_DEBOUNCE seconds without another highlight."""
+        self._pending_color = base_color
+        if self._write_timer is not None:
+            self._write_timer.stop()
+        self._write_timer = self.set_timer(WRITE_DEBOUNCE, self._flush_theme)
+
+    def _cancel_pending_write(self) -> None:
+        if self._write_timer is not None:
+            self._write_timer.stop()
+            self._write_timer = None
+        self._pending_color = None
+
+    def _flush_theme(self) -> None:
+        """Write the pending theme, unless it's the one already written."""
+        base_color = self._pending_color
+        self._cancel_pending_write()
+        if base_color is not None and base_color != self._last_written:
+            self._write_theme(base_color)
+
     def _write_theme(self, base_color: str) -> None:
         """Write theme to .vscode/settings.json."""
         write_theme(base_color, self.workspace_path)
+        self._last_written = base_color
 
     def _update_status(self, message: str) -> None:
         self.query_one("#status", Static).update(message)
@@ -0,0 +1,26 @@
+"""Hatch build hook: bake theme data into color_picker/_data.py in the wheel."""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class CustomBuildHook(BuildHookInterface):
+    def initialize(self, version, build_data):
+        self._tmp_dir = None
+        if version == "editable":
+            # Editable installs import the source tree, where _data.py is absent
+            return
+        sys.path.insert(0, self.root)
+        from scripts.bake_data import bake
+
+        self._tmp_dir = tempfile.mkdtemp()
+        data_path = bake(Path(self._tmp_dir) / "_data.py")
+        build_data["force_include"][str(data_path)] = "color_picker/_data.py"
+
+    def finalize(self, version, build_data, artifact_path):
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
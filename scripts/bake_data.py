@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Freeze colors.json and classifications.json into color_picker/_data.py.
+
+Runs automatically when building the wheel (see hatch_build.py). Can also be
+run by hand, but then re-run it after every check_contrast pass or the baked
+classifications go stale:
+  python -m scripts.bake_data
+
+Reads the files directly so it works without the package's dependencies.
+"""
+
+import json
+import sys
+from pathlib import Path
+from pprint import pformat
+
+ROOT = Path(__file__).resolve().parent.parent
+PKG_DIR = ROOT / "color_picker"
+
+
+def _first_existing(*paths: Path) -> Path:
+    return next((p for p in paths if p.exists()), paths[-1])
+
+
+def bake(output_path: Path) -> Path:
+    """Write the baked data module to output_path."""
+    # Same lookup order as get_colors_json_path / get_classifications_path
+    colors_path = _first_existing(
+        PKG_DIR / "colors.json", ROOT / "vscode-workspace-colors" / "src" / "colors.json"
+    )
+    classifications_path = _first_existing(
+        PKG_DIR / "classifications.json", ROOT / "data" / "classifications.json"
+    )
+
+    colors = json.loads(colors_path.read_text())
+    classifications = {}
+    if classifications_path.exists():
+        classifications = {entry["name"]: entry for entry in json.loads(classifications_path.read_text())}
+
+    output_path.write_text(
+        '"""Baked theme data. Generated by scripts/bake_data.py - do not edit."""\n\n'
+        f"COLORS = {pformat(colors, compact=True, sort_dicts=False)}\n\n"
+        f"CLASSIFICATIONS = {pformat(classifications, compact=True, sort_dicts=False)}\n"
+    )
+    return output_path
+
+
+def main():
+    output_path = Path(sys.argv[1]) if len(sys.argv) > 1 else PKG_DIR / "_data.py"
+    bake(output_path)
+    print(f"Saved baked data to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
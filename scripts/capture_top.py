@@ -5,9 +5,80 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
+
+import numpy as np
 from PIL import Image
 
 
+class Grabber:
+    """Repeatedly capture the same percent-box of a display.
+
+    The temp file and the pixel crop box are set up once and reused by
+    every grab(), so a loop over many themes only pays for screencapture
+    itself. Frames are taken as uncompressed BMP, which screencapture
+    writes and PIL reads back without a zlib pass over the whole display.
+    """
+
+    def __init__(
+        self,
+        display: int = 3,
+        top_percent: int = 0,
+        bottom_percent: int = 10,
+        left_percent: int = 0,
+        right_percent: int = 100,
+    ) -> None:
+        self.display = display
+        self.percents = (left_percent, top_percent, right_percent, bottom_percent)
+        with tempfile.NamedTemporaryFile(suffix=".bmp", delete=False) as tmp:
+            self.tmp_path = Path(tmp.name)
+        # Pixel (left, top, right, bottom), computed from the first frame
+        self.box: tuple[int, int, int, int] | None = None
+        # Region buffer, allocated on the first grab() and reused after
+        self._buf: np.ndarray | None = None
+
+    def _crop_box(self, width: int, height: int) -> tuple[int, int, int, int]:
+        left_percent, top_percent, right_percent, bottom_percent = self.percents
+        return (
+            int(width * left_percent / 100),
+            int(height * top_percent / 100),
+            int(width * right_percent / 100),
+            int(height * bottom_percent / 100),
+        )
+
+    def grab_image(self) -> Image.Image:
+        """Capture the full display and return it (decoded lazily by PIL)."""
+        subprocess.run(
+            ["screencapture", "-t", "bmp", f"-D{self.display}", str(self.tmp_path)], check=True
+        )
+        img = Image.open(self.tmp_path)
+        if self.box is None:
+            self.box = self._crop_box(img.width, img.height)
+        return img
+
+    def grab(self) -> np.ndarray:
+        """Capture the region minus its top third as an (H,W,3) uint8 RGB array.
+
+        The array is reused by the next grab(); copy it to keep it around.
+        """
+        img = self.grab_image()
+        left, top, right, bottom = self.box
+        # Crop in PIL so only the region (minus top 1/3) leaves the decoded frame
+        region = np.asarray(img.crop((left, top + (bottom - top) // 3, right, bottom)))
+        if self._buf is None:
+            self._buf = np.empty((region.shape[0], region.shape[1], 3), dtype=np.uint8)
+        np.copyto(self._buf, region[:, :, :3])
+        return self._buf
+
+    def close(self) -> None:
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "Grabber":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def capture_region(
     display: int = 3,
     top_percent: int = 0,
@@ -15,28 +86,28 @@ def capture_region(
     left_percent: int = 0,
     right_percent: int = 100,
     output: str = "capture.png",
-) -> None:
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-        tmp_path = tmp.name
-
-    # Capture full display
-    subprocess.run(["screencapture", f"-D{display}", tmp_path], check=True)
+    return_array: bool = False,
+) -> np.ndarray | None:
+    """Capture a percent-box of `display`, minus its top third.
 
-    # Crop to region
-    img = Image.open(tmp_path)
-    left = int(img.width * left_percent / 100)
-    right = int(img.width * right_percent / 100)
-    top = int(img.height * top_percent / 100)
-    bottom = int(img.height * bottom_percent / 100)
+    With return_array=True the region is returned as an (H,W,3) uint8 RGB
+    array instead of being written to `output`. Use Grabber directly when
+    capturing the same region many times.
+    """
+    with Grabber(display, top_percent, bottom_percent, left_percent, right_percent) as grabber:
+        if return_array:
+            return grabber.grab()
 
-    cropped = img.crop((left, top, right, bottom))
+        # Crop to region
+        img = grabber.grab_image()
+        cropped = img.crop(grabber.box)
 
-    # Remove top 1/3
-    final = cropped.crop((0, cropped.height // 3, cropped.width, cropped.height))
-    final.save(output)
+        # Remove top 1/3
+        final = cropped.crop((0, cropped.height // 3, cropped.width, cropped.height))
+        final.save(output)
 
-    Path(tmp_path).unlink()
     print(f"Captured region to {output} ({cropped.width}x{cropped.height})")
+    return None
 
 
 if __name__ == "__main__":
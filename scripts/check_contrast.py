@@ -1,125 +1,230 @@
 #!/usr/bin/env python3
 """Check contrast of all themes by capturing screenshots."""
 
+import bisect
 import json
-import tempfile
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON when installed
+    orjson = None
 
 from color_picker.base import load_themes, write_theme
-from .capture_top import capture_region
-from .contrast_rows import estimate_bg_and_text, contrast_ratio
+from .capture_top import Grabber
+from .contrast_rows import dominant_color, estimate_bg_and_text, contrast_ratio
+from .table_style import get_font, get_status_color
 
 BATCH_SIZE = 5
 DATA_DIR = Path(__file__).parent.parent / "data"
 TABLE_PATH = DATA_DIR / "contrast_table.png"
 SNAPSHOTS_DIR = DATA_DIR / "contrast_snapshots"
 CLASSIFICATIONS_PATH = DATA_DIR / "classifications.json"
+# Append-only per-result log while a run is in progress
+CHECKPOINT_PATH = CLASSIFICATIONS_PATH.with_suffix(".jsonl")
+# zlib levels: fast for progress snapshots and per-theme screenshots,
+# default for the final table
+DRAFT_COMPRESS_LEVEL = 1
+FINAL_COMPRESS_LEVEL = 6
+
+
+# Ascending contrast thresholds, and the status of each band they delimit
+STATUS_THRESHOLDS = (1.5, 2.0)
+STATUSES = ("BAD", "MID", "GOOD")
 
 
 def get_status(ratio: float) -> str:
     """Get status label for contrast ratio."""
-    if ratio >= 2.0:
-        return "GOOD"
-    elif ratio >= 1.5:
-        return "MID"
-    else:
+    # NaN (degenerate capture) must fail, but bisect would place it last
+    if not ratio >= STATUS_THRESHOLDS[0]:
         return "BAD"
+    return STATUSES[bisect.bisect_right(STATUS_THRESHOLDS, ratio)]
 
 
-def get_status_color(status: str) -> tuple[int, int, int]:
-    """Get color for status label."""
-    if status == "GOOD":
-        return (0, 150, 0)
-    elif status == "MID":
-        return (200, 150, 0)
-    else:
-        return (200, 0, 0)
+def save_png(img: Image.Image, path: Path, compress_level: int) -> None:
+    """Save a PNG via a temp file + os.replace so readers never see a partial file."""
+    tmp = path.with_name(path.name + ".tmp")
+    img.save(tmp, format="PNG", compress_level=compress_level, optimize=False)
+    os.replace(tmp, path)
 
 
-def build_table_image(results: list[dict], images: list[Image.Image]) -> Image.Image:
-    """Build a table image with all results so far."""
-    if not results:
-        raise ValueError("No results to build table from")
+def save_json(obj, path: Path) -> None:
+    """Write 2-space indented JSON (orjson when available) via temp file + os.replace."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode()
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
-    # Layout constants
-    label_width = 180
-    img_width = images[0].width if images else 275
-    img_height = images[0].height if images else 24
-    row_height = img_height
-    padding = 4
 
-    total_width = label_width + img_width + padding * 3
-    total_height = len(results) * row_height + padding * (len(results) + 1)
+def json_line(obj) -> bytes:
+    """One compact JSON line (orjson when available), newline-terminated."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj).encode() + b"\n"
 
-    # Create table
-    table = Image.new("RGB", (total_width, total_height), (40, 40, 40))
-    draw = ImageDraw.Draw(table)
 
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 12)
-    except Exception:
-        font = ImageFont.load_default()
+class TableCanvas:
+    """Rolling table image of the last `max_rows` results.
 
-    for i, (result, img) in enumerate(zip(results, images)):
-        y = padding + i * (row_height + padding)
+    Rows live in a ring of `max_rows` slots: each new row is drawn once into
+    the next slot, overwriting the oldest, and image() puts them back in
+    order (a no-op when the ring starts at slot 0, as it does every batch).
+    """
+
+    label_width = 180
+    padding = 4
+    background = (40, 40, 40)
+
+    def __init__(self, max_rows: int = BATCH_SIZE) -> None:
+        self.max_rows = max_rows
+        self.rows = 0
+        self.row_height = 0
+        self._added = 0
+        self._canvas: Image.Image | None = None
+        self._draw: ImageDraw.ImageDraw | None = None
+
+    def _row_y(self, i: int) -> int:
+        return self.padding + i * (self.row_height + self.padding)
+
+    def add_row(self, result: dict, img: Image.Image) -> None:
+        """Draw one result (label + captured image) as the newest row."""
+        if self._canvas is None:
+            self.row_height = img.height
+            width = self.label_width + img.width + self.padding * 3
+            height = self._row_y(self.max_rows)
+            self._canvas = Image.new("RGB", (width, height), self.background)
+            self._draw = ImageDraw.Draw(self._canvas)
+
+        slot = self._added % self.max_rows
+        self._added += 1
+        self.rows = min(self.rows + 1, self.max_rows)
+        y = self._row_y(slot)
+        if self._added > self.max_rows:
+            # Clear the oldest row's slot (rectangle bounds are inclusive)
+            self._draw.rectangle((0, y, self._canvas.width, self._row_y(slot + 1) - 1), fill=self.background)
 
         # Status + name + ratio
         status = get_status(result["contrast"])
         status_color = get_status_color(status)
         label = f"{status:3} {result['contrast']:4.1f} {result['name'][:15]}"
-        draw.text((padding, y + 4), label, fill=status_color, font=font)
+        self._draw.text((self.padding, y + 4), label, fill=status_color, font=get_font())
 
         # Paste captured image
-        table.paste(img, (label_width + padding * 2, y))
-
-    return table
+        self._canvas.paste(img, (self.label_width + self.padding * 2, y))
+
+    def image(self) -> Image.Image:
+        """Copy of the table with the rows drawn so far, oldest first."""
+        if self._canvas is None:
+            raise ValueError("No results to build table from")
+        width = self._canvas.width
+        oldest = self._added % self.max_rows if self._added > self.max_rows else 0
+        if oldest == 0:
+            return self._canvas.crop((0, 0, width, self._row_y(self.rows)))
+
+        # Ring has wrapped mid-batch: slots oldest.. go on top, 0..oldest-1 below
+        table = Image.new("RGB", self._canvas.size, self.background)
+        newer = self._canvas.crop((0, self._row_y(0), width, self._row_y(oldest)))
+        older = self._canvas.crop((0, self._row_y(oldest), width, self._row_y(self.max_rows)))
+        table.paste(older, (0, self._row_y(0)))
+        table.paste(newer, (0, self._row_y(self.max_rows - oldest)))
+        return table
+
+
+def save_tables(table_img: Image.Image, count: int, compress_level: int) -> None:
+    """Save the progress table (PNG) and its numbered per-batch copy (fast WEBP)."""
+    save_png(table_img, TABLE_PATH, compress_level)
+    tables_dir = SNAPSHOTS_DIR / "tables"
+    tables_dir.mkdir(parents=True, exist_ok=True)
+    table_img.save(tables_dir / f"table_{count:03d}.webp", "WEBP", quality=80, method=0)
+
+
+def wait_for_repaint(
+    grabber: Grabber,
+    prev_bg: np.ndarray | None,
+    timeout: float,
+    poll: float = 0.05,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Grab until the dominant color moves off `prev_bg`, or `timeout` elapses.
+
+    Returns the last capture and its dominant color. With no previous color
+    to compare against, just waits `timeout` before grabbing.
+    """
+    if prev_bg is None:
+        time.sleep(timeout)
+    deadline = time.monotonic() + timeout
+    while True:
+        img_arr = grabber.grab()
+        # Subsampled: only need to notice the bar color changing
+        bg = dominant_color(img_arr, stride=4)
+        if prev_bg is None or not np.array_equal(bg, prev_bg) or time.monotonic() >= deadline:
+            return img_arr, bg
+        time.sleep(poll)
 
 
 def check_all_themes(workspace: Path, delay: float = 0.2) -> list[dict]:
     """Check contrast for all themes."""
     themes = load_themes()
     results = []
-    images = []
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        total = sum(len(colors) for colors in themes.values())
-        count = 0
-
-        for category, colors in themes.items():
-            for name, hex_color in colors.items():
-                count += 1
-
-                # Apply theme
-                write_theme(hex_color, workspace)
-                time.sleep(delay)
-
-                # Capture (using finetuned params from capture_top.py)
-                capture_path = tmp_path / "capture.png"
-                capture_region(
-                    display=3,
-                    top_percent=0,
-                    bottom_percent=5,
-                    left_percent=46,
-                    right_percent=54,
-                    output=str(capture_path),
-                )
-
-                # Load and keep image
-                img = Image.open(capture_path).copy()
-                images.append(img)
+    table = TableCanvas()
+
+    entries = [
+        (category, name, hex_color)
+        for category, colors in themes.items()
+        for name, hex_color in colors.items()
+    ]
+    total = len(entries)
+    prev_bg = None
+    if not entries:
+        return results
+
+    # One grabber for the whole run (using finetuned params from capture_top.py),
+    # a writer thread so the next theme is applied while this one is analyzed,
+    # a saver thread so PNG encoding never blocks the capture loop, and an
+    # append-only checkpoint so progress costs one line per theme (never
+    # truncated, so the log of a killed run survives the next start)
+    colors_dir = SNAPSHOTS_DIR / "colors"
+    colors_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        with (
+            open(CHECKPOINT_PATH, "ab") as checkpoint,
+            Grabber(
+                display=3,
+                top_percent=0,
+                bottom_percent=5,
+                left_percent=46,
+                right_percent=54,
+            ) as grabber,
+            ThreadPoolExecutor(max_workers=1) as writer,
+            ThreadPoolExecutor(max_workers=1) as saver,
+        ):
+            pending = writer.submit(write_theme, entries[0][2], workspace)
+            saved = None
+
+            for count, (category, name, hex_color) in enumerate(entries, start=1):
+                # Wait for the theme to land, then for VS Code to repaint it
+                pending.result()
+                img_arr, prev_bg = wait_for_repaint(grabber, prev_bg, delay)
+
+                # Apply the next theme while this capture is analyzed
+                if count < total:
+                    pending = writer.submit(write_theme, entries[count][2], workspace)
+
+                # PIL image for the table and snapshot
+                img = Image.fromarray(img_arr)
 
                 # Save raw screenshot (no labels)
-                colors_dir = SNAPSHOTS_DIR / "colors"
-                colors_dir.mkdir(parents=True, exist_ok=True)
-                img.save(colors_dir / f"{name}.png")
+                img.save(colors_dir / f"{name}.png", compress_level=DRAFT_COMPRESS_LEVEL)
 
-                # Extract bg/text colors from the captured bar (preserve alpha if present)
-                img_arr = np.array(img, dtype=np.uint8)
+                # Extract bg/text colors from the captured bar
                 bg, text = estimate_bg_and_text(img_arr)
                 ratio = contrast_ratio(bg, text)
 
@@ -134,25 +239,30 @@ def check_all_themes(workspace: Path, delay: float = 0.2) -> list[dict]:
                     "text_rgb": [int(x) for x in text],
                 }
                 results.append(result)
+                checkpoint.write(json_line(result))
+                checkpoint.flush()
+                table.add_row(result, img)
 
                 print(f"[{count}/{total}] {status:4} {ratio:5.2f} {name:20} {hex_color}")
 
                 # Update every BATCH_SIZE
                 if count % BATCH_SIZE == 0 or count == total:
-                    # Save classifications
-                    with open(CLASSIFICATIONS_PATH, "w") as f:
-                        json.dump(results, f, indent=2)
-                    # Save progress table
-                    last_5_results = results[-BATCH_SIZE:]
-                    last_5_images = images[-BATCH_SIZE:]
-                    table = build_table_image(last_5_results, last_5_images)
-                    table.save(TABLE_PATH)
-                    # Save batch table
-                    tables_dir = SNAPSHOTS_DIR / "tables"
-                    tables_dir.mkdir(parents=True, exist_ok=True)
-                    table.save(tables_dir / f"table_{count:03d}.png")
+                    # Save progress table in the background (the table image is a copy);
+                    # wait for the previous save first so errors surface here
+                    if saved is not None:
+                        saved.result()
+                    level = FINAL_COMPRESS_LEVEL if count == total else DRAFT_COMPRESS_LEVEL
+                    saved = saver.submit(save_tables, table.image(), count, level)
                     print(f"  -> Updated {TABLE_PATH}")
 
+            saved.result()
+    finally:
+        # Consolidate whatever was measured into the canonical classifications
+        # file, so an interrupted run still leaves results for the TUI and
+        # generate_full_table
+        if results:
+            save_json(results, CLASSIFICATIONS_PATH)
+    CHECKPOINT_PATH.unlink()
     return results
 
 
@@ -173,7 +283,7 @@ if __name__ == "__main__":
     print(f"BAD (<1.5): {len(bad)} themes")
 
     if bad:
-        print(f"\nBAD contrast (<1.5):")
+        print("\nBAD contrast (<1.5):")
         for r in sorted(bad, key=lambda x: x["contrast"]):
             print(f"  {r['contrast']:5.2f} {r['name']} ({r['hex']})")
 
@@ -8,20 +8,31 @@ usage:
 deps:
   pillow, numpy
 (optional faster cc labeling: scipy)
+(optional compiled bg/text estimation: numba)
 """
 
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
 
 import numpy as np
 from PIL import Image
 
+try:
+    from scipy.ndimage import find_objects as _scipy_find_objects  # type: ignore
+    from scipy.ndimage import label as _scipy_label  # type: ignore
+except ImportError:  # optional: C labeling; the run-length fallback is close behind
+    _scipy_label = _scipy_find_objects = None
 
-@dataclass
-class Box:
+try:
+    from numba import njit, prange  # type: ignore
+except ImportError:  # optional: the numpy path in estimate_bg_and_text gives the same result
+    njit = None
+
+
+class Box(NamedTuple):
     x0: int
     y0: int
     x1: int
@@ -45,89 +56,242 @@ def srgb_to_linear(u: np.ndarray) -> np.ndarray:
     return np.where(u <= 0.03928, u / 12.92, ((u + 0.055) / 1.055) ** 2.4)
 
 
-def relative_luminance(rgb255: np.ndarray) -> float:
-    # rgb255 shape (3,) in [0,255]
-    rgb = np.clip(rgb255 / 255.0, 0.0, 1.0)
-    lin = srgb_to_linear(rgb)
-    return float(0.2126 * lin[0] + 0.7152 * lin[1] + 0.0722 * lin[2])
+_LUMA_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+# gamma-space luma weights x 10^4, for find_bar_boxes' background mask
+_LUMA_PROXY_WEIGHTS = np.array([2126, 7152, 722], dtype=np.float32)
+
+# srgb_to_linear for every 8-bit value; uint8 input becomes a table lookup
+_SRGB_LUT = srgb_to_linear(np.arange(256, dtype=np.float32) / 255.0).astype(np.float32)
+
+
+@lru_cache(maxsize=4096)
+def _relative_luminance_3(r: float, g: float, b: float) -> float:
+    # one color in plain floats; numpy dispatch costs more than the math here
+    lin = [
+        u / 12.92 if u <= 0.03928 else ((u + 0.055) / 1.055) ** 2.4
+        for u in (min(max(c / 255.0, 0.0), 1.0) for c in (r, g, b))
+    ]
+    return 0.2126 * lin[0] + 0.7152 * lin[1] + 0.0722 * lin[2]
+
+
+def relative_luminance(rgb255: np.ndarray) -> np.ndarray | float:
+    # rgb255 shape (..., 3) in [0,255]; returns shape (...,), a float for one color
+    rgb255 = np.asarray(rgb255)
+    if rgb255.shape == (3,):
+        return _relative_luminance_3(*rgb255.tolist())
+    if rgb255.dtype == np.uint8:
+        lin = _SRGB_LUT[rgb255]
+    else:
+        rgb = np.clip(rgb255.astype(np.float32) / 255.0, 0.0, 1.0)
+        lin = srgb_to_linear(rgb)
+    return lin @ _LUMA_WEIGHTS
 
 
-def contrast_ratio(rgb_a: np.ndarray, rgb_b: np.ndarray) -> float:
+def contrast_ratio(rgb_a: np.ndarray, rgb_b: np.ndarray) -> np.ndarray | float:
+    """
+    WCAG contrast ratio; broadcasts over (..., 3) inputs, e.g. a bg color
+    against an (N,3) pixel array for a per-pixel contrast map.
+    a single pair of colors returns a plain float.
+    """
     la = relative_luminance(rgb_a)
     lb = relative_luminance(rgb_b)
-    hi, lo = (la, lb) if la >= lb else (lb, la)
-    return (hi + 0.05) / (lo + 0.05)
+    if isinstance(la, float) and isinstance(lb, float):
+        return (max(la, lb) + 0.05) / (min(la, lb) + 0.05)
+    ratio = (np.maximum(la, lb) + 0.05) / (np.minimum(la, lb) + 0.05)
+    if ratio.ndim == 0:
+        return float(ratio)
+    return ratio
 
 
 def _label_components(mask: np.ndarray) -> Tuple[np.ndarray, int]:
     """
     returns (labels, nlabels), labels in 0..nlabels (0 = background)
-    tries scipy first; falls back to a pure-numpy flood fill.
+    uses scipy when available; otherwise labels horizontal runs and
+    union-finds runs that overlap between adjacent rows (4-connectivity).
+    both number components in raster order of their first pixel.
     """
-    try:
-        from scipy.ndimage import label  # type: ignore
-
-        labels, n = label(mask.astype(np.uint8))
+    if _scipy_label is not None:
+        labels, n = _scipy_label(mask.astype(np.uint8))
         return labels.astype(np.int32), int(n)
-    except Exception:
-        pass
 
     h, w = mask.shape
     labels = np.zeros((h, w), dtype=np.int32)
-    cur = 0
-
-    # 4-neighborhood flood fill
-    for y in range(h):
-        for x in range(w):
-            if not mask[y, x] or labels[y, x] != 0:
-                continue
-            cur += 1
-            stack = [(y, x)]
-            labels[y, x] = cur
-            while stack:
-                cy, cx = stack.pop()
-                for ny, nx in ((cy - 1, cx), (cy + 1, cx), (cy, cx - 1), (cy, cx + 1)):
-                    if 0 <= ny < h and 0 <= nx < w and mask[ny, nx] and labels[ny, nx] == 0:
-                        labels[ny, nx] = cur
-                        stack.append((ny, nx))
-
-    return labels, cur
+
+    # runs of True per row: [x0, x1) on row `rows`, in raster order
+    edges = np.diff(mask.astype(np.int8), axis=1, prepend=0, append=0)
+    rows, x0 = np.nonzero(edges == 1)
+    _, x1 = np.nonzero(edges == -1)
+    nruns = rows.size
+    if nruns == 0:
+        return labels, 0
+
+    # for each run, the previous-row runs overlapping it form a contiguous range
+    stride = w + 1
+    start_keys = rows * stride + x0
+    end_keys = rows * stride + x1
+    lo = np.searchsorted(end_keys, (rows - 1) * stride + x0, side="right")
+    hi = np.searchsorted(start_keys, (rows - 1) * stride + x1, side="left")
+    counts = np.maximum(hi - lo, 0)
+    a = np.repeat(np.arange(nruns), counts)
+    b = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+
+    parent = list(range(nruns))
+    for i, j in zip(a.tolist(), b.tolist()):
+        # find with path halving
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        while parent[j] != j:
+            parent[j] = parent[parent[j]]
+            j = parent[j]
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+    # roots are always the lowest run index, so one forward pass resolves all
+    for k in range(nruns):
+        parent[k] = parent[parent[k]]
+    roots = np.array(parent)
+
+    # number components by their first run; runs are already in raster order
+    is_root = roots == np.arange(nruns)
+    rank = np.cumsum(is_root).astype(np.int32)
+    run_labels = rank[roots]
+
+    lengths = x1 - x0
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    labels.flat[np.repeat(rows * w + x0, lengths) + offsets] = np.repeat(run_labels, lengths)
+    return labels, int(rank[-1])
+
+
+def _component_bounds(labels: np.ndarray, n: int) -> Tuple[np.ndarray, ...]:
+    """
+    bounding boxes of labels 1..n as (x0, y0, x1, y1) int arrays, upper
+    bounds exclusive. labels with no pixels are dropped.
+    """
+    if _scipy_find_objects is not None:
+        slices = [sl for sl in _scipy_find_objects(labels, max_label=n) if sl is not None]
+        bounds = np.array(
+            [(sx.start, sy.start, sx.stop, sy.stop) for sy, sx in slices], dtype=np.int64
+        ).reshape(-1, 4)
+        return tuple(bounds.T)
+
+    # one pass over the labeled pixels; nonzero is in raster order, so each
+    # label's first and last pixel give its top and bottom rows
+    ys, xs = np.nonzero(labels)
+    lab = labels[ys, xs]
+    present = np.bincount(lab, minlength=n + 1)[1:] > 0
+    top = np.full(n + 1, ys.size, dtype=np.int64)
+    np.minimum.at(top, lab, np.arange(ys.size))
+    bottom = np.zeros(n + 1, dtype=np.int64)
+    np.maximum.at(bottom, lab, np.arange(ys.size))
+    left = np.full(n + 1, labels.shape[1], dtype=np.int64)
+    np.minimum.at(left, lab, xs)
+    right = np.zeros(n + 1, dtype=np.int64)
+    np.maximum.at(right, lab, xs)
+    pick = np.flatnonzero(present) + 1
+    return left[pick], ys[top[pick]], right[pick] + 1, ys[bottom[pick]] + 1
 
 
 def find_bar_boxes(img_rgb: np.ndarray) -> List[Box]:
     """
     assumes dark outer background; bars are the big bright-ish connected components.
     """
-    # luminance proxy
-    y = (0.2126 * img_rgb[..., 0] + 0.7152 * img_rgb[..., 1] + 0.0722 * img_rgb[..., 2]).astype(np.float32)
+    # luminance proxy, scaled by 10^4: the weights become integers, so a
+    # float32 matmul computes it exactly (max 2.55e6 < 2^24)
+    y = img_rgb[..., :3].astype(np.float32) @ _LUMA_PROXY_WEIGHTS
 
-    # mask out dark background; tune threshold if needed
-    mask = y > 55.0
+    # mask out dark background (proxy > 55); tune threshold if needed
+    mask = y > 55.0 * 10_000
 
     labels, n = _label_components(mask)
+    x0, y0, x1, y1 = _component_bounds(labels, n)
+
+    # filters to keep wide bars and drop small bits
+    w, h = x1 - x0, y1 - y0
+    keep = (w * h >= 2000) & (w / np.maximum(1, h) >= 2.5) & (h >= 15)
 
-    boxes: List[Box] = []
-    for k in range(1, n + 1):
-        ys, xs = np.where(labels == k)
-        if ys.size == 0:
-            continue
-        x0, x1 = int(xs.min()), int(xs.max()) + 1
-        y0, y1 = int(ys.min()), int(ys.max()) + 1
-        b = Box(x0, y0, x1, y1)
+    # sort top to bottom (stable, so equal tops stay in label order)
+    order = np.flatnonzero(keep)
+    order = order[np.argsort(y0[order], kind="stable")]
+    return list(map(Box._make, np.stack([x0, y0, x1, y1], axis=1)[order].tolist()))
 
-        # filters to keep wide bars and drop small bits
-        if b.area < 2000:
-            continue
-        if b.w / max(1, b.h) < 2.5:
-            continue
-        if b.h < 15:
-            continue
 
-        boxes.append(b)
+def dominant_color(img_rgb: np.ndarray, step: int = 10, stride: int = 1) -> np.ndarray:
+    """
+    most frequent color after quantizing each channel to multiples of `step`.
 
-    # sort top to bottom
-    boxes.sort(key=lambda bb: bb.y0)
-    return boxes
+    channels are packed into one integer key per pixel so a single linear
+    np.bincount replaces a lexicographic np.unique(axis=0) sort.
+    stride > 1 samples every stride-th pixel along both axes first, which is
+    plenty for mostly-uniform regions like a title bar.
+    """
+    q = img_rgb[::stride, ::stride, :3].reshape(-1, 3).astype(np.int32) // step
+    nbins = 255 // step + 1
+    keys = (q[:, 0] * nbins + q[:, 1]) * nbins + q[:, 2]
+    k = int(np.argmax(np.bincount(keys)))
+    return np.array([k // (nbins * nbins), (k // nbins) % nbins, k % nbins], dtype=np.int32) * step
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _hist_median(hist, n, out):
+        # np.median from per-channel histograms of n values: the middle
+        # value, or the mean of the middle two
+        lo_k = (n - 1) // 2
+        hi_k = n // 2
+        for c in range(3):
+            seen = 0
+            lo = -1
+            for v in range(256):
+                seen += hist[c, v]
+                if lo < 0 and seen > lo_k:
+                    lo = v
+                if seen > hi_k:
+                    out[c] = (lo + v) / 2.0
+                    break
+
+    @njit(cache=True, parallel=True)
+    def _bg_and_text_jit(row_rgb, bt, bl):
+        """
+        estimate_bg_and_text's border median and thresholded text median,
+        in single passes over uint8 pixels with no temporary arrays.
+        returns (bg, text, n_text); text is only valid when n_text > 0.
+        """
+        h, w, _ = row_rgb.shape
+        hist = np.zeros((3, 256), dtype=np.int64)
+        for c in prange(3):
+            for y in range(bt):
+                for x in range(w):
+                    hist[c, row_rgb[y, x, c]] += 1
+                    hist[c, row_rgb[h - bt + y, x, c]] += 1
+            for y in range(h):
+                for x in range(bl):
+                    hist[c, row_rgb[y, x, c]] += 1
+                    hist[c, row_rgb[y, w - bl + x, c]] += 1
+        bg = np.empty(3, dtype=np.float32)
+        _hist_median(hist, 2 * bt * w + 2 * h * bl, bg)
+
+        # same doubled-integer distance test as the numpy path
+        b0, b1, b2 = np.int64(bg[0] * 2), np.int64(bg[1] * 2), np.int64(bg[2] * 2)
+        thist = np.zeros((3, 256), dtype=np.int64)
+        n_text = 0
+        for y in range(bt, h - bt):
+            for x in range(bl, w - bl):
+                r, g, b = row_rgb[y, x, 0], row_rgb[y, x, 1], row_rgb[y, x, 2]
+                d0, d1, d2 = r * 2 - b0, g * 2 - b1, b * 2 - b2
+                if d0 * d0 + d1 * d1 + d2 * d2 > 4 * 25 * 25:
+                    thist[0, r] += 1
+                    thist[1, g] += 1
+                    thist[2, b] += 1
+                    n_text += 1
+        text = np.empty(3, dtype=np.float32)
+        if n_text > 0:
+            _hist_median(thist, n_text, text)
+        return bg, text, n_text
+
+else:
+    _bg_and_text_jit = None
 
 
 def estimate_bg_and_text(row_rgba: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
@@ -152,35 +316,45 @@ def estimate_bg_and_text(row_rgba: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     else:
         raise ValueError(f"Expected 3 or 4 channels, got {c}")
 
-    # border sampling for bg
+    # border band thickness; inner region is what's left
     bt = max(1, int(0.12 * h))
     bl = max(1, int(0.06 * w))
-    border = np.concatenate(
-        [
-            row_rgb[:bt, :, :].reshape(-1, 3),
-            row_rgb[-bt:, :, :].reshape(-1, 3),
-            row_rgb[:, :bl, :].reshape(-1, 3),
-            row_rgb[:, -bl:, :].reshape(-1, 3),
-        ],
-        axis=0,
-    )
-    bg = np.median(border.astype(np.float32), axis=0)
+    if _bg_and_text_jit is not None and row_rgb.dtype == np.uint8 and bt <= h and bl <= w:
+        bg, text, n_text = _bg_and_text_jit(row_rgb, bt, bl)
+        if n_text >= 50:
+            return bg, text
+        # too few text pixels: the numpy path below handles the fallback
+
+    # border sampling for bg: top/bottom bands, then left/right bands
+    # (corners appear in both), copied into one preallocated buffer
+    border = np.empty((2 * bt * w + 2 * h * bl, 3), dtype=np.uint8)
+    n_tb, n_lr = bt * w, h * bl
+    border[:n_tb] = row_rgb[:bt, :, :].reshape(-1, 3)
+    border[n_tb:2 * n_tb] = row_rgb[-bt:, :, :].reshape(-1, 3)
+    border[2 * n_tb:2 * n_tb + n_lr] = row_rgb[:, :bl, :].reshape(-1, 3)
+    border[2 * n_tb + n_lr:] = row_rgb[:, -bl:, :].reshape(-1, 3)
+    bg = np.median(border, axis=0).astype(np.float32)
 
     # inner region for text detection
     iy0, iy1 = bt, h - bt
     ix0, ix1 = bl, w - bl
-    inner = row_rgb[iy0:iy1, ix0:ix1, :].astype(np.float32).reshape(-1, 3)
+    inner = row_rgb[iy0:iy1, ix0:ix1, :].reshape(-1, 3)
 
-    # pick pixels far from bg as "text"
-    d = np.linalg.norm(inner - bg[None, :], axis=1)
-    text_pixels = inner[d > 25.0]
+    # pick pixels far from bg (distance > 25) as "text". bg is a median, so a
+    # multiple of 0.5: doubling keeps the squared distance exact in int32
+    diff = inner.astype(np.int32) * 2 - (bg * 2).astype(np.int32)
+    d2 = np.einsum("ij,ij->i", diff, diff)
+    text_pixels = inner[d2 > 4 * 25 * 25]
 
     if text_pixels.shape[0] < 50:
         # fallback: take the farthest pixels if thresholding found too few
-        idx = np.argsort(d)[-max(50, inner.shape[0] // 200) :]
-        text_pixels = inner[idx]
+        k = max(50, inner.shape[0] // 200)
+        if k < d2.size:
+            text_pixels = inner[np.argpartition(d2, -k)[-k:]]
+        else:
+            text_pixels = inner
 
-    text = np.median(text_pixels, axis=0)
+    text = np.median(text_pixels, axis=0).astype(np.float32)
     return bg, text
 
 
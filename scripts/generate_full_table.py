@@ -2,9 +2,15 @@
 """Generate a single table with all colors sorted by contrast ratio."""
 
 import json
+import os
+import struct
+import zlib
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .table_style import get_font, get_status_color
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 CLASSIFICATIONS_PATH = DATA_DIR / "classifications.json"
@@ -12,13 +18,60 @@ COLORS_DIR = DATA_DIR / "contrast_snapshots" / "colors"
 OUTPUT_PATH = DATA_DIR / "contrast_full_table.png"
 
 
-def get_status_color(status: str) -> tuple[int, int, int]:
-    if status == "GOOD":
-        return (0, 150, 0)
-    elif status == "MID":
-        return (200, 150, 0)
-    else:
-        return (200, 0, 0)
+class PngRowWriter:
+    """
+    Streaming 8-bit RGB PNG encoder: rows are filtered and fed straight to
+    zlib, so only the rows being written are ever held in memory. Writes go to
+    a temp file that replaces path only on a clean close, so a failed run
+    leaves the previous table in place.
+    """
+
+    def __init__(self, path: Path, width: int, height: int, compress_level: int = 6) -> None:
+        self._path = path
+        self._tmp = path.with_name(path.name + ".tmp")
+        self._file = open(self._tmp, "wb")
+        self._zlib = zlib.compressobj(compress_level)
+        self._prev = np.zeros(width * 3, dtype=np.uint8)
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        # 8-bit depth, color type 2 (RGB), default compression/filter/interlace
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, tag: bytes, data: bytes) -> None:
+        self._file.write(struct.pack(">I", len(data)) + tag + data)
+        self._file.write(struct.pack(">I", zlib.crc32(tag + data)))
+
+    def write(self, rows: np.ndarray) -> None:
+        """Append (H, width, 3) uint8 rows."""
+        flat = rows.reshape(rows.shape[0], -1)
+        # PNG "Up" filter (type 2): each row minus the row above, mod 256
+        filtered = np.empty((flat.shape[0], flat.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 2
+        np.subtract(flat[0], self._prev, out=filtered[0, 1:])
+        np.subtract(flat[1:], flat[:-1], out=filtered[1:, 1:])
+        self._prev = flat[-1].copy()
+        data = self._zlib.compress(filtered.tobytes())
+        if data:
+            self._chunk(b"IDAT", data)
+
+    def close(self) -> None:
+        self._chunk(b"IDAT", self._zlib.flush())
+        self._chunk(b"IEND", b"")
+        self._file.close()
+        os.replace(self._tmp, self._path)
+
+    def abort(self) -> None:
+        """Discard the partial file, leaving path untouched."""
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self) -> "PngRowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if exc[0] is not None:
+            self.abort()
+        else:
+            self.close()
 
 
 def main():
@@ -26,10 +79,10 @@ def main():
     # Sort by contrast ratio
     data = sorted(data, key=lambda x: x["contrast"])
 
-    # Load first image to get dimensions
+    # Read dimensions from the first image's header (no decode)
     first_img_path = COLORS_DIR / f"{data[0]['name']}.png"
-    first_img = Image.open(first_img_path)
-    img_width, img_height = first_img.size
+    with Image.open(first_img_path) as first_img:
+        img_width, img_height = first_img.size
 
     # Layout
     label_width = 200
@@ -39,30 +92,39 @@ def main():
     total_width = label_width + img_width + padding * 3
     total_height = len(data) * row_height + padding * (len(data) + 1)
 
-    # Create table
-    table = Image.new("RGB", (total_width, total_height), (40, 40, 40))
-    draw = ImageDraw.Draw(table)
-
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 11)
-    except Exception:
-        font = ImageFont.load_default()
-
-    for i, entry in enumerate(data):
-        y = padding + i * (row_height + padding)
-
-        # Load screenshot
-        img_path = COLORS_DIR / f"{entry['name']}.png"
-        if img_path.exists():
-            img = Image.open(img_path)
-            table.paste(img, (label_width + padding * 2, y))
-
-        # Draw label
-        status_color = get_status_color(entry["status"])
-        label = f"{entry['status']:4} {entry['contrast']:4.2f} {entry['name'][:18]}"
-        draw.text((padding, y + 4), label, fill=status_color, font=font)
+    font = get_font(11)
+
+    # Compose one row at a time in a reusable buffer and stream it to the PNG,
+    # so memory stays O(row) however many themes there are
+    img_x = label_width + padding * 2
+    row = np.empty((row_height, total_width, 3), dtype=np.uint8)
+    gap = np.full((padding, total_width, 3), 40, dtype=np.uint8)
+    # Labels are drawn on their own small canvas and blitted in
+    label_canvas = Image.new("RGB", (img_x, row_height))
+    draw = ImageDraw.Draw(label_canvas)
+
+    with PngRowWriter(OUTPUT_PATH, total_width, total_height) as table:
+        table.write(gap)
+        for entry in data:
+            row[:, img_x:] = 40
+
+            # Decode the screenshot straight into the row buffer
+            img_path = COLORS_DIR / f"{entry['name']}.png"
+            if img_path.exists():
+                with Image.open(img_path) as img:
+                    shot = np.asarray(img.convert("RGB"))[:row_height, : total_width - img_x]
+                row[: shot.shape[0], img_x : img_x + shot.shape[1]] = shot
+
+            # Draw label
+            label_canvas.paste((40, 40, 40), (0, 0, img_x, row_height))
+            status_color = get_status_color(entry["status"])
+            label = f"{entry['status']:4} {entry['contrast']:4.2f} {entry['name'][:18]}"
+            draw.text((padding, 4), label, fill=status_color, font=font)
+            row[:, :img_x] = np.asarray(label_canvas)
+
+            table.write(row)
+            table.write(gap)
 
-    table.save(OUTPUT_PATH)
     print(f"Saved {len(data)} colors to {OUTPUT_PATH}")
 
 
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Precompute the bright variant of every theme into color_picker/colors_expanded.json.
+
+Re-run after editing colors.json or changing generate_bright_version:
+  python -m scripts.precompute_palette
+"""
+
+import json
+
+from color_picker.base import get_expanded_colors_path, load_themes
+from color_picker.base_vec import bright_palette
+
+
+def main():
+    themes = load_themes()
+    entries = [(name, hex_color) for colors in themes.values() for name, hex_color in colors.items()]
+    bright_colors = bright_palette([hex_color for _, hex_color in entries])
+
+    expanded = {
+        name: {"base": hex_color, "bright": bright_color}
+        for (name, hex_color), bright_color in zip(entries, bright_colors)
+    }
+
+    output_path = get_expanded_colors_path()
+    output_path.write_text(json.dumps(expanded, indent=2) + "\n")
+    print(f"Saved {len(expanded)} themes to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
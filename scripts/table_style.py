@@ -0,0 +1,25 @@
+"""Label colors and font shared by the contrast table scripts."""
+
+from functools import lru_cache
+
+from PIL import ImageFont
+
+STATUS_COLORS = {
+    "GOOD": (0, 150, 0),
+    "MID": (200, 150, 0),
+    "BAD": (200, 0, 0),
+}
+
+
+def get_status_color(status: str) -> tuple[int, int, int]:
+    """Get color for status label."""
+    return STATUS_COLORS.get(status, STATUS_COLORS["BAD"])
+
+
+@lru_cache(maxsize=8)
+def get_font(size: int = 12) -> ImageFont.ImageFont:
+    """Load the table label font once per size."""
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", size)
+    except Exception:
+        return ImageFont.load_default()